@@ -0,0 +1,134 @@
+"""Keep-alive HTTP transport shared by the n8n export and import scripts.
+
+Each thread keeps one http.client connection per (scheme, netloc), so repeated
+requests to the same instance reuse the socket. Connections go through
+HTTP_PROXY / HTTPS_PROXY unless NO_PROXY covers the host, as urllib would.
+"""
+from __future__ import annotations
+
+import base64
+import gzip
+import http.client
+import select
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from typing import Any, Dict
+
+HTTP_TIMEOUT = 30
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.3
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE")
+
+# http.client connections must not be shared between threads
+_LOCAL = threading.local()
+
+
+def origin(base_url: str) -> str:
+    """Return scheme://host[:port] of base_url; n8n endpoints are absolute paths, so any path is dropped."""
+    return urllib.parse.urljoin(base_url, "/").rstrip("/")
+
+
+class _ProxiedHTTPConnection(http.client.HTTPConnection):
+    """Plain-HTTP connection to a forward proxy: requests carry the absolute URL and proxy auth."""
+
+    def __init__(self, proxy_host: str, target: str, proxy_headers: Dict[str, str], timeout: float) -> None:
+        super().__init__(proxy_host, timeout=timeout)
+        self._target = target
+        self._proxy_headers = proxy_headers
+
+    def putrequest(self, method: str, url: str, *args: Any, **kwargs: Any) -> None:
+        super().putrequest(method, f"http://{self._target}{url}", *args, **kwargs)
+        for name, value in self._proxy_headers.items():
+            self.putheader(name, value)
+
+
+def _new_connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(netloc):
+        return conn_cls(netloc, timeout=timeout)
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    proxy_host = parts.hostname or ""
+    if parts.port:
+        proxy_host += f":{parts.port}"
+    proxy_headers: Dict[str, str] = {}
+    if parts.username:
+        creds = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        proxy_headers["Proxy-Authorization"] = f"Basic {base64.b64encode(creds.encode()).decode()}"
+    if scheme == "https":
+        # CONNECT tunnel through the proxy, then TLS with the target as usual
+        conn = conn_cls(proxy_host, timeout=timeout)
+        conn.set_tunnel(netloc, headers=proxy_headers)
+        return conn
+    return _ProxiedHTTPConnection(proxy_host, netloc, proxy_headers, timeout)
+
+
+def _get_connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    if not hasattr(_LOCAL, "connections"):
+        _LOCAL.connections = {}
+    key = (scheme, netloc)
+    conn = _LOCAL.connections.get(key)
+    if conn is not None and conn.sock is not None:
+        # An idle keep-alive socket that polls readable has been closed by the server
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+        if readable:
+            conn.close()
+    if conn is None:
+        conn = _new_connection(scheme, netloc, timeout)
+        _LOCAL.connections[key] = conn
+    # Pooled connections outlive the call, so apply this call's timeout every time
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection(scheme: str, netloc: str) -> None:
+    conn = getattr(_LOCAL, "connections", {}).pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def decompress(payload: bytes, encoding: str | None) -> bytes:
+    """Undo a gzip/deflate Content-Encoding."""
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(payload)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(payload)
+        except zlib.error:  # some servers send raw deflate without the zlib header
+            return zlib.decompress(payload, -zlib.MAX_WBITS)
+    return payload
+
+
+def request(base_url: str, method: str, path: str, headers: Dict[str, str], body: bytes | None = None, timeout: float = HTTP_TIMEOUT, retries: int = HTTP_RETRIES) -> tuple[http.client.HTTPResponse, bytes]:
+    """Send one request on this thread's pooled connection; return (response, decoded body bytes).
+
+    Connection errors and 502/503/504 answers are retried with backoff for idempotent
+    methods only, so a POST is never sent twice. Raises RuntimeError if the server
+    cannot be reached; any HTTP status is returned to the caller.
+    """
+    scheme, _, netloc = base_url.partition("://")
+    if method not in IDEMPOTENT_METHODS:
+        retries = 0
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(HTTP_BACKOFF * 2 ** (attempt - 1))
+        conn = _get_connection(scheme, netloc, timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            payload = resp.read()
+        except (http.client.HTTPException, OSError) as exc:
+            _drop_connection(scheme, netloc)
+            if attempt < retries:
+                continue
+            raise RuntimeError(f"Failed to reach {base_url}{path}: {exc}") from exc
+        if resp.status not in RETRY_STATUSES or attempt >= retries:
+            break
+    return resp, decompress(payload, resp.getheader("Content-Encoding"))
@@ -9,16 +9,20 @@ Usage:
 Notes:
 - This script assumes n8n uses CryptoJS AES encryption (AES-256-CBC, PKCS7 padding, PBKDF2-SHA1, 1000 iterations).
 - The encrypted blob is base64-encoded; format is likely: Salted__ + salt (8 bytes) + ciphertext.
-- Requires pycryptodome.
+- Requires cryptography.
 """
+from __future__ import annotations
+
 import os
 import json
 import pathlib
 import base64
 import sys
-from Crypto.Cipher import AES
 import hashlib
-from Crypto.Util.Padding import unpad
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.padding import PKCS7
 
 CREDENTIALS_FILE = pathlib.Path("n8n/demo-data/credentials/credentials1.json")
 
@@ -32,26 +36,45 @@ IV_LEN = 16
 
 def evp_bytes_to_key(password: bytes, salt: bytes, key_len: int, iv_len: int) -> tuple[bytes, bytes]:
     # OpenSSL EVP_BytesToKey with MD5, 1 iteration
-    dtot = b""
+    # MD5 is only a KDF here; usedforsecurity=False keeps FIPS builds from rejecting it
+    total = key_len + iv_len
+    tail = password + salt
+    out = bytearray(-(-total // 16) * 16)  # whole 16-byte MD5 blocks
+    offset = 0
     d = b""
-    while len(dtot) < (key_len + iv_len):
-        d = hashlib.md5(d + password + salt).digest()
-        dtot += d
-    return dtot[:key_len], dtot[key_len:key_len + iv_len]
+    while offset < total:
+        h = hashlib.md5(d, usedforsecurity=False)
+        h.update(tail)
+        d = h.digest()
+        out[offset:offset + 16] = d
+        offset += 16
+    return bytes(out[:key_len]), bytes(out[key_len:total])
 
 
-def decrypt_blob(blob: str, password: str) -> str:
+def decrypt_blob(blob: str, password: bytes) -> str:
     raw = base64.b64decode(blob)
     if not raw.startswith(OPENSSL_MAGIC):
         raise ValueError("Blob does not start with OpenSSL magic")
     salt = raw[8:16]
     ciphertext = raw[16:]
-    key, iv = evp_bytes_to_key(password.encode("utf-8"), salt, KEY_LEN, IV_LEN)
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    decrypted = unpad(cipher.decrypt(ciphertext), AES.block_size)
+    key, iv = evp_bytes_to_key(password, salt, KEY_LEN, IV_LEN)
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+    padded = decryptor.update(ciphertext) + decryptor.finalize()
+    unpadder = PKCS7(algorithms.AES.block_size).unpadder()
+    decrypted = unpadder.update(padded) + unpadder.finalize()
     return decrypted.decode("utf-8")
 
 
+def _decrypt_one(blob: str, key: bytes) -> tuple[object, str | None]:
+    """Return (decrypted data, None) or (None, error message) for one blob."""
+    try:
+        decrypted = decrypt_blob(blob, key)
+        # decrypted is a JSON string, parse it
+        return json.loads(decrypted), None
+    except Exception as exc:
+        return None, str(exc)
+
+
 def main():
     encryption_key = os.environ.get("N8N_ENCRYPTION_KEY")
     if not encryption_key:
@@ -61,7 +84,7 @@ def main():
         print(f"Credentials file not found: {CREDENTIALS_FILE}", file=sys.stderr)
         sys.exit(1)
     try:
-        raw = CREDENTIALS_FILE.read_text(encoding="utf-8")
+        raw = CREDENTIALS_FILE.read_bytes()
         data = json.loads(raw)
         if not isinstance(data, list):
             print("credentials1.json must be a JSON array.", file=sys.stderr)
@@ -69,36 +92,39 @@ def main():
     except Exception as exc:
         print(f"Failed to parse credentials1.json: {exc}", file=sys.stderr)
         sys.exit(1)
+    pwd_bytes = encryption_key.encode("utf-8")
+    # Exports often repeat the same encrypted blob; decrypt each distinct one once
+    blobs = list(dict.fromkeys(cred.get("data") for cred in data if isinstance(cred.get("data"), str)))
+    chunksize = max(1, len(blobs) // ((os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor() as ex:
+        cache = dict(zip(blobs, ex.map(partial(_decrypt_one, key=pwd_bytes), blobs, chunksize=chunksize)))
     output = []
     for cred in data:
         name = cred.get("name", "?")
         blob = cred.get("data")
-        cred_id = cred.get("id")
-        cred_type = cred.get("type")
-        is_managed = cred.get("isManaged", False)
-        created_at = cred.get("createdAt")
-        updated_at = cred.get("updatedAt")
         if not blob:
             print(f"Credential '{name}' missing data field.", file=sys.stderr)
             continue
-        try:
-            decrypted = decrypt_blob(blob, encryption_key)
-            # decrypted is a JSON string, parse it
-            decrypted_data = json.loads(decrypted)
-            output.append({
-                "id": cred_id,
-                "name": name,
-                "type": cred_type,
-                "data": decrypted_data,
-                "isManaged": is_managed,
-                "createdAt": created_at,
-                "updatedAt": updated_at
-            })
-        except Exception as exc:
-            print(f"Failed to decrypt credential '{name}': {exc}", file=sys.stderr)
+        if not isinstance(blob, str):
+            print(f"Failed to decrypt credential '{name}': data field is not an encrypted string", file=sys.stderr)
+            continue
+        decrypted_data, error = cache[blob]
+        if error is not None:
+            print(f"Failed to decrypt credential '{name}': {error}", file=sys.stderr)
+            continue
+        output.append({
+            "id": cred.get("id"),
+            "name": name,
+            "type": cred.get("type"),
+            "data": decrypted_data,
+            "isManaged": cred.get("isManaged", False),
+            "createdAt": cred.get("createdAt"),
+            "updatedAt": cred.get("updatedAt")
+        })
     # Write output to JSON file
     out_path = pathlib.Path("n8n/demo-data/credentials/decrypted_credentials_for_import.json")
-    out_path.write_text(json.dumps(output, indent=2), encoding="utf-8")
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
     print(f"Decrypted credentials written to {out_path}")
 
 if __name__ == "__main__":
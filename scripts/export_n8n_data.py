@@ -10,6 +10,7 @@ Environment variables:
   N8N_BASE_URL              Base URL of the live n8n instance (default: https://n8n.virtualxperiencellc.com)
   N8N_BASIC_AUTH_USER       Username for n8n basic auth
   N8N_BASIC_AUTH_PASSWORD   Password for n8n basic auth
+  HTTP_PROXY / HTTPS_PROXY  Forward proxy for outgoing requests (NO_PROXY is honoured)
 
 Example usage:
   $env:N8N_BASIC_AUTH_USER = "user@example.com"
@@ -25,23 +26,29 @@ import os
 import pathlib
 import re
 import sys
-import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Iterable
 
+import _http
+
 DEFAULT_BASE_URL = "https://n8n.virtualxperiencellc.com"
 WORKFLOWS_ENDPOINT = "/rest/workflows"
 CREDENTIALS_ENDPOINT = "/rest/credentials"
+REQUEST_TIMEOUT = 30
+DETAIL_FETCH_WORKERS = 8
+
+_SLUG_BAD = re.compile(r"[^a-z0-9._-]+")
+_SLUG_DASH = re.compile(r"-+")
 
 
 def slugify(value: str) -> str:
     """Return a filesystem-friendly slug based on the provided value."""
     value = value.strip().lower()
     # Replace invalid filename characters with dash
-    value = re.sub(r"[^a-z0-9._-]+", "-", value)
+    value = _SLUG_BAD.sub("-", value)
     # Collapse multiple consecutive dashes
-    value = re.sub(r"-+", "-", value)
+    value = _SLUG_DASH.sub("-", value)
     return value.strip("-") or "workflow"
 
 
@@ -51,24 +58,21 @@ def build_auth_headers(user: str, password: str) -> Dict[str, str]:
         "Authorization": f"Basic {token}",
         "Accept": "application/json",
         "Content-Type": "application/json",
+        "Accept-Encoding": "gzip, deflate",
         "User-Agent": "n8n-export-script/1.0",
     }
 
 
 def fetch_json(base_url: str, path: str, headers: Dict[str, str]) -> Any:
-    url = urllib.parse.urljoin(base_url, path)
-    request = urllib.request.Request(url, headers=headers)
-    try:
-        with urllib.request.urlopen(request) as response:
-            charset = response.headers.get_content_charset() or "utf-8"
-            return json.loads(response.read().decode(charset))
-    except urllib.error.HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="ignore") if exc.fp else ""
+    url = f"{base_url}{path}"
+    response, payload = _http.request(base_url, "GET", path, headers, timeout=REQUEST_TIMEOUT)
+    if not 200 <= response.status < 300:
+        body = payload.decode("utf-8", errors="ignore")
         raise RuntimeError(
-            f"HTTP {exc.code} error while fetching {url}: {body or exc.reason}"
-        ) from exc
-    except urllib.error.URLError as exc:
-        raise RuntimeError(f"Failed to reach {url}: {exc.reason}") from exc
+            f"HTTP {response.status} error while fetching {url}: {body or response.reason}"
+        )
+    # json.loads takes the raw UTF-8 bytes, so no decoded str copy is made
+    return json.loads(payload)
 
 
 def ensure_directory(path: pathlib.Path) -> None:
@@ -76,44 +80,46 @@ def ensure_directory(path: pathlib.Path) -> None:
 
 
 def write_json(path: pathlib.Path, data: Any) -> None:
-    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
 
 
 def export_workflows(base_url: str, headers: Dict[str, str], output_dir: pathlib.Path) -> int:
     listing = fetch_json(base_url, WORKFLOWS_ENDPOINT, headers)
     workflows = listing.get("data") or []
-    count = 0
-    for workflow in workflows:
-        workflow_id = workflow.get("id")
-        if workflow_id is None:
-            continue
-        detail = fetch_json(base_url, f"{WORKFLOWS_ENDPOINT}/{workflow_id}", headers)
+    workflow_ids = [w.get("id") for w in workflows if w.get("id") is not None]
+    with ThreadPoolExecutor(max_workers=DETAIL_FETCH_WORKERS) as ex:
+        details = list(ex.map(
+            lambda workflow_id: fetch_json(base_url, f"{WORKFLOWS_ENDPOINT}/{workflow_id}", headers),
+            workflow_ids,
+        ))
+    for workflow_id, detail in zip(workflow_ids, details):
         name = detail.get("name") or f"workflow-{workflow_id}"
         filename = f"{workflow_id}-{slugify(name)}.json"
         write_json(output_dir / filename, detail)
-        count += 1
-    return count
+    return len(details)
 
 
 def export_credentials(base_url: str, headers: Dict[str, str], output_dir: pathlib.Path) -> int:
     params = urllib.parse.urlencode({"includeData": "true"})
     listing = fetch_json(base_url, f"{CREDENTIALS_ENDPOINT}?{params}", headers)
     credentials: Iterable[Dict[str, Any]] = listing.get("data") or []
-    count = 0
-    for credential in credentials:
-        credential_id = credential.get("id")
-        if credential_id is None:
-            continue
-        # When includeData=true, the API already returns full data for each credential
-        # but we fetch the detail endpoint as well to keep parity with workflow export.
-        detail = fetch_json(
-            base_url, f"{CREDENTIALS_ENDPOINT}/{credential_id}?{params}", headers
-        )
+    credential_ids = [c.get("id") for c in credentials if c.get("id") is not None]
+    # When includeData=true, the API already returns full data for each credential
+    # but we fetch the detail endpoint as well to keep parity with workflow export.
+    with ThreadPoolExecutor(max_workers=DETAIL_FETCH_WORKERS) as ex:
+        details = list(ex.map(
+            lambda credential_id: fetch_json(
+                base_url, f"{CREDENTIALS_ENDPOINT}/{credential_id}?{params}", headers
+            ),
+            credential_ids,
+        ))
+    for credential_id, detail in zip(credential_ids, details):
         name = detail.get("name") or f"credential-{credential_id}"
         filename = f"{credential_id}-{slugify(name)}.json"
         write_json(output_dir / filename, detail)
-        count += 1
-    return count
+    return len(details)
 
 
 def parse_args(argv: Iterable[str]) -> argparse.Namespace:
@@ -152,7 +158,7 @@ def main(argv: Iterable[str]) -> int:
         return 1
 
     headers = build_auth_headers(user, password)
-    base_url = args.base_url.rstrip("/") + "/"
+    base_url = _http.origin(args.base_url)
 
     export_workflows_flag = args.workflows or not (args.workflows or args.credentials)
     export_credentials_flag = args.credentials or not (args.workflows or args.credentials)
@@ -26,18 +26,23 @@ import json
 import pathlib
 import sys
 import urllib.request
-import urllib.parse
 import urllib.error
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import _http
 
 CREDENTIALS_FILE_DEFAULT = pathlib.Path("n8n/demo-data/credentials/decrypted_credentials_for_import.json")
 CREDENTIALS_ENDPOINT = "/api/v1/credentials"
+HTTP_WORKERS = 8
+ALLOWED_CREDENTIAL_KEYS = {"name", "type", "data", "nodesAccess", "tags", "isManaged"}
 
 
 def build_headers(api_key: str) -> dict:
     return {
         "Accept": "application/json",
         "Content-Type": "application/json",
+        "Accept-Encoding": "gzip, deflate",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "X-N8N-API-KEY": api_key,
     }
@@ -50,13 +55,13 @@ def fetch_schema(base_url: str, headers: dict, cred_type: str, cache: dict) -> O
         return None
     if cred_type in cache:
         return cache[cred_type]
-    url = urllib.parse.urljoin(base_url, f"/api/v1/credentials/schema/{cred_type}")
+    url = f"{base_url}{CREDENTIALS_ENDPOINT}/schema/{cred_type}"
     req = urllib.request.Request(url, headers=headers, method="GET")
     try:
         with urllib.request.urlopen(req) as resp:
             if resp.status != 200:
                 raise RuntimeError(f"Unexpected status {resp.status} for GET {url}")
-            schema = json.loads(resp.read().decode("utf-8"))
+            schema = json.loads(_http.decompress(resp.read(), resp.headers.get("Content-Encoding")))
             cache[cred_type] = schema
             return schema
     except Exception as exc:
@@ -75,23 +80,9 @@ def sanitize_data(data: dict, schema: Optional[dict]) -> dict:
             sanitized[prop] = prop_schema["default"]
     return sanitized
 
-def post_credential(base_url: str, headers: dict, cred: dict, schema_cache: dict) -> str:
-    url = urllib.parse.urljoin(base_url, CREDENTIALS_ENDPOINT)
-    allowed_keys = {"name", "type", "data", "nodesAccess", "tags", "isManaged"}
-    cred_type = cred.get("type") or ""
-    data = cred.get("data", {})
-    schema = fetch_schema(base_url, headers, cred_type, schema_cache)
-    if schema and "required" in schema:
-        sanitized = sanitize_data(data, schema)
-        missing = [req for req in schema["required"] if req not in sanitized]
-        if missing:
-            print(f"Skipping credential '{cred.get('name','?')}' (missing required fields: {missing})", file=sys.stderr)
-            return "error:missing_required"
-        payload = {k: v for k, v in cred.items() if k in allowed_keys}
-        payload["data"] = sanitized
-    else:
-        print(f"Warning: No schema for credential type '{cred_type}' (credential '{cred.get('name','?')}')", file=sys.stderr)
-        payload = {k: v for k, v in cred.items() if k in allowed_keys}
+def post_credential(base_url: str, headers: dict, payload: dict) -> str:
+    """POST an already sanitized credential payload."""
+    url = f"{base_url}{CREDENTIALS_ENDPOINT}"
     data_bytes = json.dumps(payload).encode("utf-8")
     req = urllib.request.Request(url, data=data_bytes, headers=headers, method="POST")
     try:
@@ -100,11 +91,11 @@ def post_credential(base_url: str, headers: dict, cred: dict, schema_cache: dict
                 raise RuntimeError(f"Unexpected status {resp.status} for POST {url}")
             return f"created:{resp.status}"
     except urllib.error.HTTPError as exc:
-        body_txt = exc.read().decode("utf-8", errors="ignore") if exc.fp else ""
-        print(f"Failed to import credential '{cred.get('name','?')}' (HTTP {exc.code}): {body_txt or exc.reason}", file=sys.stderr)
+        body_txt = _http.decompress(exc.read(), exc.headers.get("Content-Encoding")).decode("utf-8", errors="ignore") if exc.fp else ""
+        print(f"Failed to import credential '{payload.get('name','?')}' (HTTP {exc.code}): {body_txt or exc.reason}", file=sys.stderr)
         return f"error:{exc.code}"
     except Exception as exc:
-        print(f"Failed to import credential '{cred.get('name','?')}' ({exc})", file=sys.stderr)
+        print(f"Failed to import credential '{payload.get('name','?')}' ({exc})", file=sys.stderr)
         return "error:unknown"
 
 
@@ -119,12 +110,13 @@ def main():
     if not base_url or not api_key:
         print("Missing N8N_BASE_URL or N8N_API_KEY environment variable.", file=sys.stderr)
         sys.exit(1)
+    base_url = _http.origin(base_url)
     cred_file = pathlib.Path(args.input)
     if not cred_file.exists():
         print(f"Credentials file not found: {cred_file}", file=sys.stderr)
         sys.exit(1)
     try:
-        raw = cred_file.read_text(encoding="utf-8")
+        raw = cred_file.read_bytes()
         data = json.loads(raw)
         if not isinstance(data, list):
             print("Credentials file must be a JSON array.", file=sys.stderr)
@@ -134,12 +126,18 @@ def main():
         sys.exit(1)
     headers = build_headers(api_key)
     schema_cache = {}
+    # Fetch each distinct credential type's schema once, concurrently, up front
+    cred_types = {cred.get("type") or "" for cred in data}
+    with ThreadPoolExecutor(max_workers=HTTP_WORKERS) as ex:
+        list(ex.map(lambda t: fetch_schema(base_url, headers, t, schema_cache), cred_types))
     success = 0
     skipped = 0
+    to_import = []
     for cred in data:
         cred_type = cred.get("type") or ""
         data_obj = cred.get("data", {})
         schema = fetch_schema(base_url, headers, cred_type, schema_cache)
+        payload = {k: v for k, v in cred.items() if k in ALLOWED_CREDENTIAL_KEYS}
         if schema and "required" in schema:
             sanitized = sanitize_data(data_obj, schema)
             missing = [req for req in schema["required"] if req not in sanitized]
@@ -147,13 +145,18 @@ def main():
                 print(f"Skipping credential '{cred.get('name','?')}' (missing required fields: {missing})", file=sys.stderr)
                 skipped += 1
                 continue
+            payload["data"] = sanitized
+        elif not args.dry_run:
+            print(f"Warning: No schema for credential type '{cred_type}' (credential '{cred.get('name','?')}')", file=sys.stderr)
         if args.dry_run:
             print(f"[DRY-RUN] Would import credential '{cred.get('name','?')}' of type '{cred_type}'")
             success += 1
         else:
-            result = post_credential(base_url, headers, cred, schema_cache)
-            if result.startswith("created"):
-                success += 1
+            to_import.append(payload)
+    if to_import:
+        with ThreadPoolExecutor(max_workers=HTTP_WORKERS) as ex:
+            results = ex.map(lambda payload: post_credential(base_url, headers, payload), to_import)
+            success += sum(1 for result in results if result.startswith("created"))
     print(f"{'Dry-run:' if args.dry_run else 'Imported'} {success} credentials out of {len(data)}. Skipped: {skipped}.")
 
 if __name__ == "__main__":
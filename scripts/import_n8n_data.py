@@ -1,5 +1,3 @@
-from __future__ import annotations
-import time
 #!/usr/bin/env python3
 """Import workflows and credentials into an n8n instance via REST API.
 Intended for seeding a freshly deployed Render-hosted (or any) n8n service
@@ -15,6 +13,8 @@ Environment variables:
     N8N_BASIC_AUTH_PASSWORD   Password for n8n basic auth (required)
     N8N_SKIP_CREDENTIALS      If set to any truthy value, skip credential import
     N8N_SKIP_WORKFLOWS        If set to any truthy value, skip workflow import
+    N8N_IMPORT_CONCURRENCY    Default for --concurrency (default: 8)
+    HTTP_PROXY / HTTPS_PROXY  Forward proxy for outgoing requests (NO_PROXY is honoured)
 Example usage (PowerShell):
     $env:N8N_BASE_URL = "https://your-n8n.onrender.com";
     $env:N8N_BASIC_AUTH_USER = "user@example.com";
@@ -25,39 +25,92 @@ Notes:
     only if the target instance uses the SAME N8N_ENCRYPTION_KEY.
 * Ensure you have set the identical N8N_ENCRYPTION_KEY in Render before running.
 """
+from __future__ import annotations
+
 import argparse
 import base64
+import gzip
+import hashlib
 import json
 import os
 import pathlib
 import sys
+import tempfile
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from typing import Any, Dict, Iterable
 
+import _http
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 WORKFLOWS_ENDPOINT = "/api/v1/workflows"
 CREDENTIALS_ENDPOINT = "/api/v1/credentials"
+FILE_READ_WORKERS = 16
+DEFAULT_IMPORT_CONCURRENCY = 8
+DEFAULT_IMPORT_RATE = 2.0  # upserts per second across all workers, kept low for the WAF
+BULK_WORKFLOW_BATCH = 50
+BULK_CREDENTIAL_BATCH = 25
+REMOTE_LIST_PAGE_SIZE = 250
+READY_PROBE_TIMEOUT = 3
+GZIP_MIN_BODY = 1024  # smaller bodies are not worth compressing
+# Remembers "<base_url>\n<endpoint>" of the last successful readiness probe across runs
+READY_CACHE = pathlib.Path(tempfile.gettempdir(), ".n8n_ready")
+
+# Properties accepted by the n8n public API; anything else is stripped before upload
+_ALLOWED_WF_KEYS = frozenset({"name", "nodes", "connections", "settings"})
+_ALLOWED_SETTINGS_KEYS = frozenset({
+    "saveDataErrorExecution",
+    "saveDataSuccessExecution",
+    "saveManualExecutions",
+    "executionTimeout",
+    "timezone",
+    "retryOnFail",
+    "maxTries",
+    "errorWorkflow",
+})
+_ALLOWED_NODE_KEYS = frozenset({
+    "id", "name", "type", "parameters", "position", "credentials", "disabled", "notes",
+    "retryOnFail", "maxTries", "errorWorkflow", "webhookId", "version",
+})
+_ALLOWED_CRED_KEYS = frozenset({"name", "type", "data", "nodesAccess", "tags", "isManaged"})
+# Bulk bodies have no per-item URL, so the id is kept in the payload
+_BULK_CRED_KEYS = _ALLOWED_CRED_KEYS | {"id"}
+
+_BASE_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Content-Type": "application/json",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.google.com/",
+    "Origin": "https://www.google.com/",
+}
+_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.1 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/117.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_14_6) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.5993.70 Safari/537.36",
+)
+
+
+def _dumps(obj: Any) -> bytes:
+    # stdlib json: orjson rejects integers wider than 64 bits, which workflow files may hold
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 
 def build_auth_headers(user: str | None, password: str | None, api_key: str | None) -> Dict[str, str]:
-    import random
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.1 Safari/605.1.15",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/117.0",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_14_6) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.5993.70 Safari/537.36",
-    ]
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "User-Agent": random.choice(user_agents),
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://www.google.com/",
-        "Origin": "https://www.google.com/",
-    }
+    # Same UA for every request and every run with the same identity; a UA that
+    # changes between runs behind the same Basic Auth user invites WAF challenges
+    identity = (api_key or user or "").encode("utf-8")
+    user_agent = _USER_AGENTS[hashlib.sha256(identity).digest()[0] % len(_USER_AGENTS)]
+    headers = _BASE_HEADERS | {"User-Agent": user_agent}
     if api_key:
         headers["X-N8N-API-KEY"] = api_key
     elif user and password:
@@ -66,116 +119,319 @@ def build_auth_headers(user: str | None, password: str | None, api_key: str | No
     return headers
 
 
-def request_json(base_url: str, method: str, path: str, headers: Dict[str, str], body: Any | None = None, expected: Iterable[int] = (200, 201)) -> Any:
-    url = urllib.parse.urljoin(base_url, path)
-    data_bytes = None
-    if body is not None:
-        data_bytes = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(url, data=data_bytes, headers=headers, method=method)
+class N8nClient:
+    """One n8n instance: its origin, auth headers and whether request bodies are gzipped.
+
+    Requests share the pooled keep-alive connections in _http.
+    """
+
+    def __init__(self, base_url: str, headers: Dict[str, str], gzip_bodies: bool = False) -> None:
+        self.base_url = base_url
+        self.headers = headers
+        # Cleared when the server rejects a gzip-encoded body with a 4xx
+        self.gzip_bodies = gzip_bodies
+
+    def request_json(self, method: str, path: str, body: Any | None = None, *, expected: Iterable[int] = (200, 201), timeout: float = _http.HTTP_TIMEOUT, retries: int = _http.HTTP_RETRIES, return_status: bool = False, body_bytes: bytes | None = None) -> Any:
+        """Send one request and return the parsed body, or (status, body) when return_status is set.
+
+        body_bytes is an already serialized JSON body and takes the place of body.
+        Statuses outside expected raise RuntimeError.
+        """
+        url = f"{self.base_url}{path}"
+        data_bytes = body_bytes
+        if data_bytes is None and body is not None:
+            data_bytes = _dumps(body)
+        send_headers = self.headers
+        if data_bytes is not None and self.gzip_bodies and len(data_bytes) > GZIP_MIN_BODY:
+            data_bytes = gzip.compress(data_bytes, compresslevel=6)
+            send_headers = {**self.headers, "Content-Encoding": "gzip"}
+        resp, payload = _http.request(self.base_url, method, path, send_headers, body=data_bytes, timeout=timeout, retries=retries)
+        if send_headers is not self.headers and 400 <= resp.status < 500 and resp.status not in expected:
+            # Servers and WAFs answer 400/403/411/415 to encodings they refuse; a rejected body
+            # was not applied, so resending it uncompressed is safe even for POST
+            self.gzip_bodies = False
+            return self.request_json(method, path, body, expected=expected, timeout=timeout, retries=retries, return_status=return_status, body_bytes=body_bytes)
+        if resp.status not in expected:
+            body_txt = payload.decode("utf-8", errors="ignore")
+            raise RuntimeError(f"HTTP {resp.status} {method} {url}: {body_txt or resp.reason}")
+        content_type = resp.getheader("Content-Type", "")
+        if "application/json" in content_type:
+            # Responses only yield ids, statuses and listing digests; orjson turning a >64-bit
+            # integer into a float there can only cause a redundant PUT, never altered data
+            result = orjson.loads(payload) if orjson else json.loads(payload)
+        else:
+            result = payload.decode("utf-8", errors="ignore")
+        return (resp.status, result) if return_status else result
+
+
+def _read_and_parse(path: pathlib.Path) -> tuple[pathlib.Path, Any]:
+    """Return (path, parsed data) or (path, exception) so one bad file does not stop the pool."""
     try:
-        with urllib.request.urlopen(req) as resp:
-            if resp.status not in expected:
-                raise RuntimeError(f"Unexpected status {resp.status} for {method} {url}")
-            content_type = resp.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                charset = resp.headers.get_content_charset() or "utf-8"
-                return json.loads(resp.read().decode(charset))
-            return resp.read().decode("utf-8", errors="ignore")
-    except urllib.error.HTTPError as exc:
-        body_txt = exc.read().decode("utf-8", errors="ignore") if exc.fp else ""
-        raise RuntimeError(f"HTTP {exc.code} {method} {url}: {body_txt or exc.reason}") from exc
-    except urllib.error.URLError as exc:
-        raise RuntimeError(f"Failed to reach {url}: {exc.reason}") from exc
-
-
-def load_json_files(directory: pathlib.Path) -> list[tuple[pathlib.Path, Any]]:
-
-    """Load JSON files from directory. Supports single object or array of objects. Returns list of (source_path, object) pairs."""
+        return path, json.loads(path.read_bytes())
+    except Exception as exc:  # noqa: BLE001
+        return path, exc
+
+
+def load_json_files(directory: pathlib.Path, pattern: str = "*.json") -> list[tuple[pathlib.Path, Any]]:
+
+    """Load JSON files matching pattern from directory. Supports single object or array of objects. Returns list of (source_path, object) pairs."""
     items: list[tuple[pathlib.Path, Any]] = []
     if not directory.exists():
         return items
-    for path in sorted(directory.glob("*.json")):
-        try:
-            raw = path.read_text(encoding="utf-8")
-            data = json.loads(raw)
-            if isinstance(data, list):
-                for idx, element in enumerate(data):
-                    if not isinstance(element, dict):  # skip non-object entries
-                        print(f"Skipping {path} index {idx} (not an object)", file=sys.stderr)
-                        continue
-                    # Use a synthetic display path (original path kept for parent reference)
-                    synthetic = pathlib.Path(f"{path.name}#{idx}")
-                    items.append((synthetic, element))
-            else:
-                items.append((path, data))
-        except Exception as exc:  # noqa: BLE001
-            print(f"Skipping {path} (invalid JSON): {exc}", file=sys.stderr)
+    paths = sorted(directory.glob(pattern))
+    if not paths:
+        return items
+    # Read and parse on the pool; map() keeps results in sorted order
+    with ThreadPoolExecutor(max_workers=min(FILE_READ_WORKERS, len(paths))) as ex:
+        parsed = list(ex.map(_read_and_parse, paths))
+    for path, data in parsed:
+        if isinstance(data, Exception):
+            print(f"Skipping {path} (invalid JSON): {data}", file=sys.stderr)
+        elif isinstance(data, list):
+            for idx, element in enumerate(data):
+                if not isinstance(element, dict):  # skip non-object entries
+                    print(f"Skipping {path} index {idx} (not an object)", file=sys.stderr)
+                    continue
+                # Use a synthetic display path (original path kept for parent reference)
+                synthetic = pathlib.Path(f"{path.name}#{idx}")
+                items.append((synthetic, element))
+        else:
+            items.append((path, data))
     return items
 
 
-def upsert_workflow(base_url: str, headers: Dict[str, str], workflow: Dict[str, Any]) -> str:
+def sanitize_workflow(workflow: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the subset of a workflow accepted by the n8n public API."""
+    wf_payload: Dict[str, Any] = {}
+    # One pass over the workflow; settings and nodes are filtered as they are reached
+    for key, value in workflow.items():
+        if key not in _ALLOWED_WF_KEYS:
+            continue
+        if key == "settings":
+            value = {k: v for k, v in value.items() if k in _ALLOWED_SETTINGS_KEYS} if isinstance(value, dict) else {}
+        elif key == "nodes" and isinstance(value, list):
+            # Sanitize each node in the nodes list to only allowed properties
+            value = [
+                {k: v for k, v in node.items() if k in _ALLOWED_NODE_KEYS}
+                if isinstance(node, dict) else node
+                for node in value
+            ]
+        wf_payload[key] = value
+    wf_payload.setdefault("settings", {})
+    return wf_payload
+
+
+def payload_digest(payload: Any) -> str:
+    """Stable SHA-256 of a JSON payload (keys sorted) for change detection."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def fetch_remote_workflow_digests(client: N8nClient) -> Dict[str, str] | None:
+    """List all workflows on the server once and map id -> digest of the sanitized payload.
+
+    Returns None if the listing fails.
+    """
+    digests: Dict[str, str] = {}
+    cursor: str | None = None
+    try:
+        while True:
+            path = f"{WORKFLOWS_ENDPOINT}?limit={REMOTE_LIST_PAGE_SIZE}"
+            if cursor:
+                path += f"&cursor={urllib.parse.quote(cursor)}"
+            listing = client.request_json("GET", path, expected=(200,))
+            for workflow in listing.get("data") or []:
+                if workflow.get("id"):
+                    digests[str(workflow["id"])] = payload_digest(sanitize_workflow(workflow))
+            cursor = listing.get("nextCursor")
+            if not cursor:
+                return digests
+    except (RuntimeError, AttributeError) as exc:
+        print(f"Warning: could not list remote workflows: {exc}", file=sys.stderr)
+        return None
+
+
+def load_import_cache(path: pathlib.Path) -> Dict[str, str]:
+    """Read the {workflow id: payload digest} manifest written by a previous run, or {} if unusable."""
+    try:
+        cache = json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as exc:  # noqa: BLE001
+        print(f"Warning: ignoring unreadable import cache {path}: {exc}", file=sys.stderr)
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_import_cache(path: pathlib.Path, cache: Dict[str, str]) -> None:
+    try:
+        path.write_bytes(_dumps(cache))
+    except OSError as exc:
+        print(f"Warning: could not write import cache {path}: {exc}", file=sys.stderr)
+
+
+class TokenBucket:
+    """Allow `rate` acquire() calls per second across all threads, with bursts of up to `burst`.
+
+    Callers only sleep when they would exceed the rate, so time already spent
+    on the request itself counts towards the spacing. rate <= 0 disables it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A negative balance reserves a future slot for this caller
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+def upsert_workflow(client: N8nClient, workflow: Dict[str, Any], remote_digests: Dict[str, str] | None = None, limiter: TokenBucket | None = None, import_cache: Dict[str, str] | None = None) -> str:
     workflow_id = workflow.get("id")
-    # Only include allowed properties for n8n public API
-    allowed_keys = {"name", "nodes", "connections", "settings"}
-    wf_payload = {k: v for k, v in workflow.items() if k in allowed_keys}
-    # Only allow specific keys in settings for n8n public API
-    allowed_settings_keys = {
-        "saveDataErrorExecution",
-        "saveDataSuccessExecution",
-        "saveManualExecutions",
-        "executionTimeout",
-        "timezone",
-        "retryOnFail",
-        "maxTries",
-        "errorWorkflow"
-    }
-    if "settings" in wf_payload and isinstance(wf_payload["settings"], dict):
-        wf_payload["settings"] = {k: v for k, v in wf_payload["settings"].items() if k in allowed_settings_keys}
-    else:
-        wf_payload["settings"] = {}
-
-    # Sanitize each node in the nodes list to only allowed properties
-    allowed_node_keys = {
-        "id", "name", "type", "parameters", "position", "credentials", "disabled", "notes",
-        "retryOnFail", "maxTries", "errorWorkflow", "webhookId", "version"
-    }
-    if "nodes" in wf_payload and isinstance(wf_payload["nodes"], list):
-        wf_payload["nodes"] = [
-            {k: v for k, v in node.items() if k in allowed_node_keys}
-            if isinstance(node, dict) else node
-            for node in wf_payload["nodes"]
-        ]
+    wf_payload = sanitize_workflow(workflow)
+    digest = payload_digest(wf_payload) if workflow_id and (remote_digests or import_cache is not None) else ""
+    if digest and remote_digests and remote_digests.get(str(workflow_id)) == digest:
+        # Still matches the server, so keep it in the manifest for runs where listing fails
+        if import_cache is not None:
+            import_cache[str(workflow_id)] = digest
+        return f"skipped:{workflow_id}"
+    if limiter:
+        limiter.acquire()
+    # Serialized once; the PUT and a 404 fallback POST send the same bytes
+    body_bytes = _dumps(wf_payload)
     if not workflow_id:
-        created = request_json(base_url, "POST", WORKFLOWS_ENDPOINT, headers, wf_payload, (200, 201))
+        created = client.request_json("POST", WORKFLOWS_ENDPOINT, expected=(200, 201), body_bytes=body_bytes)
         return f"created:{created.get('id','?')}"
-    # Try update
-    try:
-        # For update, keep id in path, but remove from body
-        request_json(base_url, "PUT", f"{WORKFLOWS_ENDPOINT}/{workflow_id}", headers, wf_payload, (200,))
-        return f"updated:{workflow_id}"
-    except RuntimeError as exc:
-        if "404" in str(exc):
-            created = request_json(base_url, "POST", WORKFLOWS_ENDPOINT, headers, wf_payload, (200, 201))
-            return f"created_after_404:{created.get('id','?')}"
-        raise
+    # Try update; for update, keep id in path, but remove from body
+    status, _ = client.request_json("PUT", f"{WORKFLOWS_ENDPOINT}/{workflow_id}", expected=(200, 404), return_status=True, body_bytes=body_bytes)
+    if status == 404:
+        created = client.request_json("POST", WORKFLOWS_ENDPOINT, expected=(200, 201), body_bytes=body_bytes)
+        return f"created_after_404:{created.get('id','?')}"
+    if import_cache is not None:
+        import_cache[str(workflow_id)] = digest
+    return f"updated:{workflow_id}"
 
 
-def upsert_credential(base_url: str, headers: Dict[str, str], credential: Dict[str, Any]) -> str:
+def upsert_credential(client: N8nClient, credential: Dict[str, Any], limiter: TokenBucket | None = None) -> str:
     credential_id = credential.get("id")
-    # Only include allowed properties for n8n public API
-    allowed_keys = {"name", "type", "data", "nodesAccess", "tags", "isManaged"}
-    cred_payload = {k: v for k, v in credential.items() if k in allowed_keys}
+    cred_payload = {k: v for k, v in credential.items() if k in _ALLOWED_CRED_KEYS}
+    if limiter:
+        limiter.acquire()
+    body_bytes = _dumps(cred_payload)
     if not credential_id:
-        created = request_json(base_url, "POST", CREDENTIALS_ENDPOINT, headers, cred_payload, (200, 201))
+        created = client.request_json("POST", CREDENTIALS_ENDPOINT, expected=(200, 201), body_bytes=body_bytes)
         return f"created:{created.get('id','?')}"
-    try:
-        request_json(base_url, "PUT", f"{CREDENTIALS_ENDPOINT}/{credential_id}", headers, cred_payload, (200,))
-        return f"updated:{credential_id}"
-    except RuntimeError as exc:
-        if "404" in str(exc):
-            created = request_json(base_url, "POST", CREDENTIALS_ENDPOINT, headers, cred_payload, (200, 201))
-            return f"created_after_404:{created.get('id','?')}"
-        raise
+    status, _ = client.request_json("PUT", f"{CREDENTIALS_ENDPOINT}/{credential_id}", expected=(200, 404), return_status=True, body_bytes=body_bytes)
+    if status == 404:
+        created = client.request_json("POST", CREDENTIALS_ENDPOINT, expected=(200, 201), body_bytes=body_bytes)
+        return f"created_after_404:{created.get('id','?')}"
+    return f"updated:{credential_id}"
+
+
+def _post_batches(kind: str, objects: list[tuple[pathlib.Path, Any]], payloads: list[Dict[str, Any]], client: N8nClient, endpoint: str, batch_size: int, limiter: TokenBucket | None) -> list[tuple[str, str]] | None:
+    """POST payloads to a bulk endpoint as {"<kind>s": [...]} in chunks of batch_size.
+
+    The endpoint must answer with a JSON list (or {"results": [...]}) holding one
+    {"id", "status"} entry per item, in request order. Returns (status, summary action)
+    per item, or None when the first batch gets a 404/405 so the caller can fall back
+    to per-item upserts.
+    """
+    actions: list[tuple[str, str]] = []
+    for start in range(0, len(payloads), batch_size):
+        chunk = objects[start:start + batch_size]
+        if limiter:
+            limiter.acquire()
+        status, resp = client.request_json("POST", endpoint, {f"{kind}s": payloads[start:start + batch_size]}, expected=(200, 201, 404, 405), return_status=True)
+        if status in (404, 405):
+            if start == 0:
+                print(f"Bulk endpoint {endpoint} not available; importing {kind}s one by one")
+                return None
+            # Some batches already went through, so a per-item fallback would resend them
+            raise RuntimeError(f"HTTP {status} POST {endpoint}: bulk endpoint disappeared after {start} {kind}s")
+        items = resp.get("results") if isinstance(resp, dict) else resp
+        if not isinstance(items, list) or len(items) != len(chunk):
+            raise RuntimeError(f"Unexpected response from bulk endpoint {endpoint}: expected {len(chunk)} results")
+        for (path, _), item in zip(chunk, items):
+            item = item if isinstance(item, dict) else {}
+            status = str(item.get("status", "ok"))
+            actions.append((status, f"{kind}:{path.name}:{status}:{item.get('id', '?')}"))
+    return actions
+
+
+def batch_upsert_workflows(client: N8nClient, workflows: list[tuple[pathlib.Path, Any]], endpoint: str, remote_digests: Dict[str, str] | None = None, batch_size: int = BULK_WORKFLOW_BATCH, limiter: TokenBucket | None = None, import_cache: Dict[str, str] | None = None) -> list[str] | None:
+    """Upsert workflows through a bulk endpoint. Returns None if the server does not provide it."""
+    results: list[str | None] = [None] * len(workflows)
+    pending: list[tuple[pathlib.Path, Any]] = []
+    pending_idx: list[int] = []
+    payloads: list[Dict[str, Any]] = []
+    digests: list[str] = []
+    for idx, (path, workflow) in enumerate(workflows):
+        workflow_id = workflow.get("id")
+        wf_payload = sanitize_workflow(workflow)
+        digest = payload_digest(wf_payload) if workflow_id and (remote_digests or import_cache is not None) else ""
+        if digest and remote_digests and remote_digests.get(str(workflow_id)) == digest:
+            if import_cache is not None:
+                import_cache[str(workflow_id)] = digest
+            results[idx] = f"workflow:{path.name}:skipped:{workflow_id}"
+            continue
+        if workflow_id:
+            # The bulk body has no per-item URL, so the id travels in the payload
+            wf_payload["id"] = workflow_id
+        pending.append((path, workflow))
+        pending_idx.append(idx)
+        payloads.append(wf_payload)
+        digests.append(digest)
+    posted = _post_batches("workflow", pending, payloads, client, endpoint, batch_size, limiter)
+    if posted is None:
+        return None
+    for idx, (_, workflow), digest, (status, action) in zip(pending_idx, pending, digests, posted):
+        results[idx] = action
+        if import_cache is not None and digest and status == "updated":
+            import_cache[str(workflow["id"])] = digest
+    return [action for action in results if action is not None]
+
+
+def batch_upsert_credentials(client: N8nClient, credentials: list[tuple[pathlib.Path, Any]], endpoint: str, batch_size: int = BULK_CREDENTIAL_BATCH, limiter: TokenBucket | None = None) -> list[str] | None:
+    """Upsert credentials through a bulk endpoint. Returns None if the server does not provide it."""
+    payloads = [{k: v for k, v in cred.items() if k in _BULK_CRED_KEYS} for _, cred in credentials]
+    posted = _post_batches("credential", credentials, payloads, client, endpoint, batch_size, limiter)
+    return None if posted is None else [action for _, action in posted]
+
+
+def import_objects(kind: str, objects: list[tuple[pathlib.Path, Any]], upsert, client: N8nClient, concurrency: int) -> list[str]:
+    """Upsert objects on a thread pool. Returns summary actions in input order; 403s are logged and skipped."""
+    results: list[str | None] = [None] * len(objects)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        futures = {ex.submit(upsert, client, obj): idx for idx, (_, obj) in enumerate(objects)}
+        try:
+            for future in as_completed(futures):
+                idx = futures[future]
+                name = objects[idx][0].name
+                try:
+                    results[idx] = f"{kind}:{name}:{future.result()}"
+                except RuntimeError as exc:
+                    if "403" in str(exc):
+                        print(f"403 Forbidden on {kind} {name}: {exc}", file=sys.stderr)
+                    else:
+                        raise
+        except BaseException:
+            # Stop queued upserts from starting once one has failed
+            for future in futures:
+                future.cancel()
+            raise
+    return [action for action in results if action is not None]
 
 
 def parse_args(argv: Iterable[str]) -> argparse.Namespace:
@@ -186,32 +442,73 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
     p.add_argument("--ready-interval", type=float, default=2.0, metavar="SEC", help="Polling interval while waiting for readiness (default: 2s)")
     p.add_argument("--min-workflows", type=int, default=0, help="Fail if fewer than this many workflow JSON objects are discovered locally")
     p.add_argument("--min-credentials", type=int, default=0, help="Fail if fewer than this many credential JSON objects are discovered locally")
+    p.add_argument("--concurrency", type=int, default=os.environ.get("N8N_IMPORT_CONCURRENCY") or DEFAULT_IMPORT_CONCURRENCY, help=f"Number of upserts in flight at once (default: N8N_IMPORT_CONCURRENCY or {DEFAULT_IMPORT_CONCURRENCY})")
+    p.add_argument("--rate", type=float, default=DEFAULT_IMPORT_RATE, metavar="PER_SEC", help=f"Maximum upserts per second across all workers, 0 for no limit (default: {DEFAULT_IMPORT_RATE:g})")
+    p.add_argument("--burst", type=int, default=1, metavar="N", help="Let up to N upserts go out back-to-back before --rate pacing applies (default: 1)")
+    p.add_argument("--bulk-workflows-endpoint", metavar="PATH", help=f"POST workflows in batches of {BULK_WORKFLOW_BATCH} to this bulk endpoint (e.g. a proxy in front of n8n); falls back to per-item upserts on 404/405")
+    p.add_argument("--bulk-credentials-endpoint", metavar="PATH", help=f"POST credentials in batches of {BULK_CREDENTIAL_BATCH} to this bulk endpoint; falls back to per-item upserts on 404/405")
+    p.add_argument("--force-update", action="store_true", help="PUT every workflow even if the server copy is already identical")
+    p.add_argument("--import-cache", type=pathlib.Path, metavar="PATH", help="Record digests of updated and unchanged workflows in PATH (e.g. .n8n_import_cache.json) and use them to skip unchanged workflows when the server cannot be listed")
+    p.add_argument("--gzip-requests", action="store_true", help=f"gzip request bodies over {GZIP_MIN_BODY} bytes; turned off again if the server rejects one with a 4xx")
     p.add_argument("--ready-log-every", type=int, default=10, metavar="N", help="Log a probe failure every N attempts (default: 10)")
     return p.parse_args(list(argv))
 
 
-def wait_for_ready(base_url: str, headers: Dict[str, str], timeout_seconds: int, interval: float, log_every: int) -> bool:
+def wait_for_ready(client: N8nClient, timeout_seconds: int, interval: float, log_every: int) -> bool:
     """Poll endpoints until ready or timeout. 200/401 from /rest/workflows or 200 from /rest/healthz/healthz is considered ready."""
     if timeout_seconds <= 0:
         return True
     endpoints = [WORKFLOWS_ENDPOINT, "/api/v1/healthz", "/healthz"]
+
+    def probe(ep: str) -> str | None:
+        """Return None if ep answered as ready, otherwise the error text."""
+        try:
+            # Accept both 200 and 401 for workflows endpoint
+            expected = (200, 401) if ep == WORKFLOWS_ENDPOINT else (200,)
+            # Short timeout and no retries: the polling loop is the retry
+            client.request_json("GET", ep, expected=expected, timeout=READY_PROBE_TIMEOUT, retries=0)
+            return None
+        except Exception as exc:  # noqa: BLE001
+            return f"{ep}: {exc}"
+
+    def remember(ep: str) -> None:
+        try:
+            READY_CACHE.write_text(f"{client.base_url}\n{ep}", encoding="utf-8")
+        except OSError:
+            pass
+
+    # Warm restart: one probe of the endpoint that answered last time for this instance
+    try:
+        cached_url, _, cached_ep = READY_CACHE.read_text(encoding="utf-8").partition("\n")
+    except OSError:
+        cached_url = cached_ep = ""
+    if cached_url == client.base_url and cached_ep in endpoints and probe(cached_ep) is None:
+        print(f"Service ready via cached endpoint {cached_ep}")
+        return True
+
     deadline = time.time() + timeout_seconds
     attempt = 0
     last_error: str | None = None
-    while time.time() < deadline:
-        attempt += 1
-        for ep in endpoints:
-            try:
-                # Accept both 200 and 401 for workflows endpoint
-                expected = (200, 401) if ep == WORKFLOWS_ENDPOINT else (200,)
-                request_json(base_url, "GET", ep, headers, None, expected)
-                print(f"Service ready after {attempt} attempt(s) via {ep}")
-                return True
-            except Exception as exc:  # noqa: BLE001
-                last_error = f"{ep}: {exc}"
-        if attempt % max(1, log_every) == 0 and last_error:
-            print(f"Still waiting (attempt {attempt}) - last error: {last_error}")
-        time.sleep(interval)
+    # Probe all endpoints at once and stop at the first one that answers
+    ex = ThreadPoolExecutor(max_workers=len(endpoints))
+    try:
+        while time.time() < deadline:
+            attempt += 1
+            futures = {ex.submit(probe, ep): ep for ep in endpoints}
+            for future in as_completed(futures):
+                error = future.result()
+                if error is None:
+                    ep = futures[future]
+                    print(f"Service ready after {attempt} attempt(s) via {ep}")
+                    remember(ep)
+                    return True
+                last_error = error
+            if attempt % max(1, log_every) == 0 and last_error:
+                print(f"Still waiting (attempt {attempt}) - last error: {last_error}")
+            time.sleep(interval)
+    finally:
+        # Slower probes still in flight are bounded by READY_PROBE_TIMEOUT; don't wait for them
+        ex.shutdown(wait=False, cancel_futures=True)
     if last_error:
         print(f"Final readiness failure after {attempt} attempts: {last_error}", file=sys.stderr)
     return False
@@ -226,16 +523,7 @@ def main(argv: Iterable[str]) -> int:
     credentials_dir = args.root / "credentials"
     workflow_files = load_json_files(workflows_dir)
     # Only import credentials from decrypted_credentials_for_import.json
-    decrypted_file = credentials_dir / 'decrypted_credentials_for_import.json'
-    credential_files = []
-    if decrypted_file.exists():
-        with open(decrypted_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                for idx, cred in enumerate(data):
-                    credential_files.append((decrypted_file.with_name(f"{decrypted_file.name}#{idx}"), cred))
-            else:
-                credential_files.append((decrypted_file, data))
+    credential_files = load_json_files(credentials_dir, "decrypted_credentials_for_import.json")
     print(f"Prepared {len(workflow_files)} workflow objects, {len(credential_files)} credential objects")
 
     # Local count sanity checks before any API requirement
@@ -254,8 +542,7 @@ def main(argv: Iterable[str]) -> int:
     if not base_url:
         print("Error: N8N_BASE_URL (or WEBHOOK_URL) must be set", file=sys.stderr)
         return 1
-    if not base_url.endswith("/"):
-        base_url += "/"
+    base_url = _http.origin(base_url)
 
     api_key = os.environ.get("N8N_API_KEY")
     user = os.environ.get("N8N_BASIC_AUTH_USER")
@@ -268,46 +555,52 @@ def main(argv: Iterable[str]) -> int:
     skip_workflows = bool(os.environ.get("N8N_SKIP_WORKFLOWS"))
     skip_credentials = bool(os.environ.get("N8N_SKIP_CREDENTIALS"))
 
-    headers = build_auth_headers(user, password, api_key)
+    client = N8nClient(base_url, build_auth_headers(user, password, api_key), gzip_bodies=args.gzip_requests)
 
-    if not wait_for_ready(base_url, headers, args.wait_ready, args.ready_interval, args.ready_log_every):
+    if not wait_for_ready(client, args.wait_ready, args.ready_interval, args.ready_log_every):
         print(f"Error: n8n API not ready after --wait-ready {args.wait_ready} seconds", file=sys.stderr)
         return 1
 
+    # One limiter for the whole run keeps the request rate WAF-safe regardless of --concurrency
+    limiter = TokenBucket(args.rate, args.burst)
+    import_cache = load_import_cache(args.import_cache) if args.import_cache else None
     actions: list[str] = []
 
     try:
         if not skip_workflows:
-            for path, wf in workflow_files:
-                try:
-                    result = upsert_workflow(base_url, headers, wf)
-                    actions.append(f"workflow:{path.name}:{result}")
-                except RuntimeError as exc:
-                    if "403" in str(exc):
-                        print(f"403 Forbidden on workflow {path.name}: {exc}", file=sys.stderr)
-                    else:
-                        raise
-                time.sleep(1)  # Add delay to avoid WAF rate limits
+            # Credential data is never returned by the API, so only workflows can be diffed
+            remote_digests = None if args.force_update else fetch_remote_workflow_digests(client)
+            if remote_digests is None and import_cache and not args.force_update:
+                # The server listing is authoritative; the local manifest only stands in when it is unavailable
+                print(f"Using {args.import_cache} to skip workflows unchanged since the last import")
+                remote_digests = dict(import_cache)
+            imported = None
+            if args.bulk_workflows_endpoint:
+                imported = batch_upsert_workflows(client, workflow_files, args.bulk_workflows_endpoint, remote_digests, limiter=limiter, import_cache=import_cache)
+            if imported is None:
+                upsert = partial(upsert_workflow, remote_digests=remote_digests, limiter=limiter, import_cache=import_cache)
+                imported = import_objects("workflow", workflow_files, upsert, client, args.concurrency)
+            actions += imported
         else:
             print("Skipping workflows (N8N_SKIP_WORKFLOWS set)")
 
         if not skip_credentials:
-            for path, cred in credential_files:
-                try:
-                    result = upsert_credential(base_url, headers, cred)
-                    actions.append(f"credential:{path.name}:{result}")
-                except RuntimeError as exc:
-                    if "403" in str(exc):
-                        print(f"403 Forbidden on credential {path.name}: {exc}", file=sys.stderr)
-                    else:
-                        raise
-                time.sleep(2)  # Add delay to avoid WAF blocks
+            imported = None
+            if args.bulk_credentials_endpoint:
+                imported = batch_upsert_credentials(client, credential_files, args.bulk_credentials_endpoint, limiter=limiter)
+            if imported is None:
+                imported = import_objects("credential", credential_files, partial(upsert_credential, limiter=limiter), client, args.concurrency)
+            actions += imported
         else:
             print("Skipping credentials (N8N_SKIP_CREDENTIALS set)")
 
     except RuntimeError as exc:
         print(f"Import failed: {exc}", file=sys.stderr)
         return 1
+    finally:
+        # Saved even after a failure so the workflows that did go through are remembered
+        if import_cache is not None:
+            save_import_cache(args.import_cache, import_cache)
 
     print("Import summary:")
     for a in actions:
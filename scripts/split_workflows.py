@@ -2,18 +2,53 @@
 import json
 import re
 import pathlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    import ijson
+except ImportError:  # optional; streams the array instead of loading it whole
+    ijson = None
+
+OUT_DIR = pathlib.Path('n8n/demo-data/workflows')
+WRITE_WORKERS = 8
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')  # name is lower-cased before matching
 
 def slugify(name):
-    return re.sub(r'[^a-zA-Z0-9]+', '-', name.lower()).strip('-')
+    return _SLUG_RE.sub('-', name.lower()).strip('-')
+
+def iter_workflows(path):
+    done = 0
+    if ijson:
+        try:
+            with open(path, 'rb') as f:
+                # use_float keeps numbers as float instead of Decimal so json.dump can write them
+                for wf in ijson.items(f, 'item', use_float=True):
+                    yield wf
+                    done += 1
+            return
+        except ijson.JSONError:
+            # The C backend rejects integers beyond 64 bits; json handles them, so finish from there
+            pass
+    with open(path, 'rb') as f:
+        yield from json.load(f)[done:]
 
-with open('n8n/demo-data/workflows/workflows1.json', 'r', encoding='utf-8') as f:
-    workflows = json.load(f)
+def write_one(wf):
+    filename = f"{wf['id']}-{slugify(wf['name'])}.json"
+    (OUT_DIR / filename).write_bytes(json.dumps(wf, indent=2).encode('utf-8'))
 
-for wf in workflows:
-    wf_id = wf['id']
-    name = wf['name']
-    filename = f"{wf_id}-{slugify(name)}.json"
-    with open(f"n8n/demo-data/workflows/{filename}", 'w') as f:
-        json.dump(wf, f, indent=2)
+count = 0
+with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as ex:
+    # Bound the in-flight writes so streamed workflows are not all queued in memory
+    pending = set()
+    for wf in iter_workflows(OUT_DIR / 'workflows1.json'):
+        if len(pending) >= WRITE_WORKERS * 2:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                fut.result()
+        pending.add(ex.submit(write_one, wf))
+        count += 1
+    for fut in pending:
+        fut.result()
 
-print(f"Split {len(workflows)} workflows into separate files.")
\ No newline at end of file
+print(f"Split {count} workflows into separate files.")